@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+pytest公共夹具
+"""
+
+import os
+import sqlite3
+
+import pytest
+
+from inventory_manager import (DEFAULT_DB_PATH, InventoryManager, connect_db,
+                               is_memory_db, resolve_db_path)
+
+# 测试使用共享内存数据库，不读写磁盘上的inventory.db，进程结束即销毁。
+# 部分测试模块在导入时就打开验证连接，因此需在收集测试前设置环境变量；
+# 已设置INVENTORY_DB_URL时（如指向某个文件库排查问题）保持不变
+MEMORY_DB_URL = "file::memory:?cache=shared"
+os.environ.setdefault("INVENTORY_DB_URL", MEMORY_DB_URL)
+
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", default=False,
+                     help="运行标记为slow的耗时测试（如Excel导出）")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: 耗时较长的测试，默认跳过，加 --runslow 运行")
+
+def pytest_collection_modifyitems(config, items):
+    """未指定 --runslow 时跳过slow测试"""
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="耗时测试，加 --runslow 运行")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+@pytest.fixture(scope="session", autouse=True)
+def _db():
+    """
+    测试会话期间保持内存数据库存活，并以inventory.db的现有数据作为初始数据
+    
+    测试中的修改、删除只作用于内存副本，不会影响磁盘上的数据库；
+    INVENTORY_DB_URL经resolve_db_path解析，与管理器等打开的是同一个库
+    """
+    db_url = resolve_db_path()
+    anchor = connect_db(db_url)
+    if is_memory_db(db_url) and os.path.exists(DEFAULT_DB_PATH):
+        source = sqlite3.connect(DEFAULT_DB_PATH)
+        source.backup(anchor)
+        source.close()
+    yield db_url
+    anchor.close()
+
+@pytest.fixture(scope="session")
+def manager(_db):
+    """整个测试会话共享一个库存管理器，避免每个测试重复初始化数据库"""
+    return InventoryManager()
+
+@pytest.fixture
+def txn_manager(manager):
+    """在事务中运行测试，结束后整体回滚，测试产生的数据无需手动清理"""
+    with manager.transaction(rollback=True):
+        yield manager
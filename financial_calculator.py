@@ -5,23 +5,24 @@
 基于文档中的现实财务模型进行精确的利润计算
 """
 
-import sqlite3
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import json
 
+from inventory_manager import connect_db, resolve_db_path
+
 class FinancialCalculator:
     """财务测算器类"""
     
-    def __init__(self, db_path: str = "inventory.db"):
+    def __init__(self, db_path: Optional[str] = None):
         """
         初始化财务计算器
         
         Args:
-            db_path: 数据库文件路径
+            db_path: 数据库文件路径或SQLite URI，未指定时与InventoryManager一致
         """
-        self.db_path = db_path
+        self.db_path = resolve_db_path(db_path)
         
         # 基于文档的财务参数
         self.financial_params = {
@@ -36,7 +37,8 @@ class FinancialCalculator:
         }
     
     def calculate_transaction_profit(self, inventory_id: int, ad_resource_id: int,
-                                   channel_id: int, proposed_sale_price: Optional[float] = None) -> Dict[str, Any]:
+                                   channel_id: int, proposed_sale_price: Optional[float] = None,
+                                   inventory_row: Optional[Dict] = None) -> Dict[str, Any]:
         """
         计算单个交易的详细利润分析
         
@@ -45,6 +47,9 @@ class FinancialCalculator:
         - 8万收入 - 3万成本 = 5万净利
         - 回报率：5/3 ≈ 166%
         
+        inventory_row 为已通过InventoryManager.get_inventory_with_brand读取的库存数据，
+        提供时不再查询库存
+        
         Returns:
             {
                 'feasibility': bool,           # 交易可行性
@@ -57,21 +62,24 @@ class FinancialCalculator:
                 'recommendations': list        # 建议措施
             }
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_db(self.db_path)
         
         try:
             # 获取库存信息
-            inventory_df = pd.read_sql_query('''
-                SELECT i.*, b.brand_name, b.reputation_score
-                FROM inventory i
-                JOIN brands b ON i.brand_id = b.id
-                WHERE i.id = ?
-            ''', conn, params=(inventory_id,))
-            
-            if inventory_df.empty:
-                return {'error': '库存记录不存在', 'feasibility': False}
-            
-            inventory = inventory_df.iloc[0]
+            if inventory_row is not None:
+                inventory = pd.Series(inventory_row)
+            else:
+                inventory_df = pd.read_sql_query('''
+                    SELECT i.*, b.brand_name, b.reputation_score
+                    FROM inventory i
+                    JOIN brands b ON i.brand_id = b.id
+                    WHERE i.id = ?
+                ''', conn, params=(inventory_id,))
+                
+                if inventory_df.empty:
+                    return {'error': '库存记录不存在', 'feasibility': False}
+                
+                inventory = inventory_df.iloc[0]
             
             # 获取广告资源信息
             ad_resource_df = pd.read_sql_query('''
@@ -365,7 +373,7 @@ class FinancialCalculator:
         """
         生成利润预测报告
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_db(self.db_path)
         
         try:
             # 获取历史交易数据
@@ -440,7 +448,7 @@ class FinancialCalculator:
         """
         生成财务报告
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_db(self.db_path)
         
         try:
             # 构建查询条件
@@ -5,31 +5,166 @@
 用于管理广告资源、品牌方、商品库存、销售渠道等业务数据
 """
 
+import csv
 import sqlite3
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import IO, Dict, List, Optional, Tuple, Union
 import json
 import os
+import uuid
+
+# 默认数据库文件，可通过环境变量INVENTORY_DB_URL覆盖
+# （支持SQLite URI，如测试使用的共享内存库 file::memory:?cache=shared）
+DEFAULT_DB_PATH = "inventory.db"
+
+# 数据库结构版本号（记录在PRAGMA user_version中），表结构变更时递增
+SCHEMA_VERSION = 1
+
+# UPDATE ... RETURNING 需要 SQLite 3.35.0 及以上版本
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# 添加库存时写入的字段（与add_inventory的参数一一对应）
+INVENTORY_INSERT_FIELDS = ('brand_id', 'product_name', 'category', 'quantity',
+                           'original_value', 'market_value', 'expiry_date',
+                           'storage_location', 'jd_link', 'tmall_link',
+                           'xianyu_link', 'pdd_link')
+
+def _memory_db_url() -> str:
+    """生成一个独立命名的共享缓存内存库URI，新建的连接都能访问同一个内存库"""
+    return f"file:inventory_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+# 环境变量INVENTORY_DB_URL为 ":memory:" 时整个进程共用的内存库
+ENV_MEMORY_DB_URL = _memory_db_url()
+
+def resolve_db_path(db_path: Optional[str] = None) -> str:
+    """
+    解析数据库路径
+    
+    未指定时读取环境变量INVENTORY_DB_URL，缺省为inventory.db。
+    参数为 ":memory:" 时每次生成一个新的内存库，供单个管理器独立使用；
+    环境变量为 ":memory:" 时映射到进程内唯一的ENV_MEMORY_DB_URL，
+    使管理器、计算器等各自解析路径的对象访问同一个内存库
+    """
+    if db_path == ":memory:":
+        return _memory_db_url()
+    db_path = db_path or os.getenv("INVENTORY_DB_URL", DEFAULT_DB_PATH)
+    if db_path == ":memory:":
+        return ENV_MEMORY_DB_URL
+    return db_path
+
+def connect_db(db_path: str, **kwargs) -> sqlite3.Connection:
+    """打开数据库连接，以 file: 开头的路径按URI解析"""
+    return sqlite3.connect(db_path, uri=db_path.startswith("file:"), **kwargs)
+
+def is_memory_db(db_path: str) -> bool:
+    """是否为内存数据库（最后一个连接关闭时数据即被销毁）"""
+    return db_path.startswith("file::memory:") or "mode=memory" in db_path
+
+class _TransactionConnection(sqlite3.Connection):
+    """
+    InventoryManager.transaction() 期间各方法共用的连接
+    
+    方法内部的 commit/rollback/close 均不生效，由 transaction() 统一提交或回滚；
+    close 时重置方法内设置的 row_factory，避免影响后续调用
+    """
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        pass
+    
+    def close(self):
+        self.row_factory = None
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
 
 class InventoryManager:
     """广告置换库存管理核心类"""
     
-    def __init__(self, db_path: str = "inventory.db"):
+    def __init__(self, db_path: Optional[str] = None):
         """
         初始化库存管理器
         
         Args:
-            db_path: 数据库文件路径
+            db_path: 数据库文件路径、SQLite URI或":memory:"，未指定时见resolve_db_path
         """
-        self.db_path = db_path
+        self.db_path = resolve_db_path(db_path)
+        # 共享内存库在所有连接关闭后会被销毁，管理器存活期间保持一个连接
+        self._keepalive = connect_db(self.db_path) if is_memory_db(self.db_path) else None
+        # transaction() 期间所有方法共用的连接
+        self._txn_conn = None
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """
+        打开数据库连接
+        
+        数据库使用WAL日志模式（在init_database中设置，持久保存在文件中），
+        配合synchronous=NORMAL，每次提交不再单独fsync，只在检查点时同步；
+        处于transaction()中时返回事务共用的连接
+        """
+        if self._txn_conn is not None:
+            return self._txn_conn
+        conn = connect_db(self.db_path)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+    
+    @contextmanager
+    def transaction(self, rollback: bool = False):
+        """
+        将多次增删改合并为一个事务
+        
+        with块内调用的管理器方法共用同一个连接，正常退出时统一提交一次，
+        发生异常时整体回滚；嵌套调用时并入外层事务。
+        SQLite同一时间只有一个写事务，事务期间不应在其他线程中使用同一管理器
+        
+        Args:
+            rollback: 为True时正常退出也整体回滚，用于测试中丢弃全部修改
+        
+        Yields:
+            事务使用的数据库连接
+        """
+        if self._txn_conn is not None:
+            yield self._txn_conn
+            return
+        
+        conn = connect_db(self.db_path, factory=_TransactionConnection)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        self._txn_conn = conn
+        try:
+            yield conn
+            if rollback:
+                sqlite3.Connection.rollback(conn)
+            else:
+                sqlite3.Connection.commit(conn)
+        except BaseException:
+            sqlite3.Connection.rollback(conn)
+            raise
+        finally:
+            self._txn_conn = None
+            sqlite3.Connection.close(conn)
+    
     def init_database(self):
         """初始化数据库表结构"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
+        # 启用WAL日志模式（已启用时为空操作）
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
+        # 结构已是当前版本时跳过建表、迁移和默认规则初始化
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] == SCHEMA_VERSION:
+            conn.close()
+            return
+        
+        # 各表主键均为 INTEGER PRIMARY KEY（即rowid别名），按id查询直接走rowid B树，
+        # 无需再为id单独建索引
+        
         # 媒体资源表（增强版）
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS media_resources (
@@ -156,6 +291,8 @@ class InventoryManager:
         # 初始化默认风控规则
         self.init_default_risk_rules(cursor)
         
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        
         conn.commit()
         conn.close()
     
@@ -255,7 +392,7 @@ class InventoryManager:
         if actual_cost is None:
             actual_cost = market_price * discount_rate / 100
             
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -279,7 +416,7 @@ class InventoryManager:
                   contact_phone: Optional[str] = None, contact_email: Optional[str] = None,
                   brand_type: Optional[str] = None, reputation_score: int = 5) -> int:
         """添加品牌方"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -308,7 +445,7 @@ class InventoryManager:
         Returns:
             新创建的资源ID
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # 如果没有提供实际成本，则自动计算
@@ -353,7 +490,7 @@ class InventoryManager:
                       jd_link: Optional[str] = None, tmall_link: Optional[str] = None,
                       xianyu_link: Optional[str] = None, pdd_link: Optional[str] = None) -> int:
         """添加库存商品"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -372,16 +509,48 @@ class InventoryManager:
         
         return inventory_id
     
-    def update_inventory(self, inventory_id: int, **kwargs) -> bool:
+    def bulk_add_inventory(self, rows: List[Dict]) -> List[int]:
+        """
+        批量添加库存商品（单个事务内executemany插入）
+        
+        Args:
+            rows: 库存数据列表，每项为字典，键与add_inventory的参数相同，未提供的可选字段为None
+            
+        Returns:
+            新增库存的ID列表，顺序与rows一致
+        """
+        if not rows:
+            return []
+        
+        values = [tuple(row.get(field) for field in INVENTORY_INSERT_FIELDS) for row in rows]
+        placeholders = ', '.join('?' * len(INVENTORY_INSERT_FIELDS))
+        
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.executemany(
+                    f"INSERT INTO inventory ({', '.join(INVENTORY_INSERT_FIELDS)}) VALUES ({placeholders})",
+                    values
+                )
+                # 同一事务内AUTOINCREMENT分配的ID连续，由最后一个ID倒推全部ID
+                last_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+        finally:
+            conn.close()
+        
+        return list(range(last_id - cursor.rowcount + 1, last_id + 1))
+    
+    def update_inventory(self, inventory_id: int, return_row: bool = False,
+                         **kwargs) -> Union[bool, Dict]:
         """
         更新库存商品信息
         
         Args:
             inventory_id: 库存ID
+            return_row: 为True时更新成功后返回更新后的整行数据（字典）
             **kwargs: 要更新的字段，如 product_name, category, quantity, original_value, market_value, expiry_date, storage_location, status
             
         Returns:
-            更新成功返回True，失败返回False
+            更新成功返回True（return_row为True时返回更新后的行字典），失败返回False
         """
         conn = None
         try:
@@ -390,7 +559,9 @@ class InventoryManager:
                 print(f"❌ 无效的库存ID: {inventory_id}")
                 return False
             
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
+            if return_row:
+                conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             
             # 检查库存是否存在
@@ -441,17 +612,29 @@ class InventoryManager:
             update_values.append(inventory_id)  # WHERE条件
             
             update_sql = f"UPDATE inventory SET {', '.join(update_fields)} WHERE id = ?"
+            if return_row and SUPPORTS_RETURNING:
+                # 更新后的行随UPDATE一起返回，省去一次查询
+                update_sql += " RETURNING *"
             
             print(f"📝 执行更新SQL: {update_sql}")
             print(f"📝 更新参数: {update_values}")
             
             result = cursor.execute(update_sql, update_values)
-            affected_rows = result.rowcount
+            if return_row and SUPPORTS_RETURNING:
+                rows = result.fetchall()
+                affected_rows = len(rows)
+            else:
+                affected_rows = result.rowcount
             
             if affected_rows > 0:
                 conn.commit()
                 print(f"✅ 库存更新成功，影响行数: {affected_rows}")
-                return True
+                if not return_row:
+                    return True
+                if not SUPPORTS_RETURNING:
+                    rows = cursor.execute('SELECT * FROM inventory WHERE id = ?',
+                                          (inventory_id,)).fetchall()
+                return dict(rows[0])
             else:
                 print("⚠️ 没有行被更新")
                 return False
@@ -488,7 +671,7 @@ class InventoryManager:
                 print(f"❌ 无效的品牌ID: {brand_id}")
                 return False
             
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
             
             # 检查品牌是否存在
@@ -578,7 +761,7 @@ class InventoryManager:
         Returns:
             更新成功返回True，失败返回False
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -598,6 +781,18 @@ class InventoryManager:
             
             for field, value in kwargs.items():
                 if field in allowed_fields:
+                    # 特殊处理金额和折扣率：不能为负数，折扣率不超过100%
+                    if field in ['market_price', 'discount_rate', 'actual_cost']:
+                        if value is not None:
+                            try:
+                                value = float(value)
+                                if value < 0 or (field == 'discount_rate' and value > 100):
+                                    print(f"⚠️ 字段 {field} 的值超出有效范围: {value}")
+                                    continue
+                            except (ValueError, TypeError):
+                                print(f"⚠️ 字段 {field} 的值无效: {value}")
+                                continue
+                    
                     update_fields.append(f"{field} = ?")
                     update_values.append(value)
             
@@ -631,7 +826,7 @@ class InventoryManager:
         Returns:
             更新成功返回True，失败返回False
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -649,6 +844,18 @@ class InventoryManager:
             
             for field, value in kwargs.items():
                 if field in allowed_fields:
+                    # 特殊处理佣金比例：必须在0-100%之间
+                    if field == 'commission_rate':
+                        if value is not None:
+                            try:
+                                value = float(value)
+                                if not (0 <= value <= 100):
+                                    print(f"⚠️ 佣金比例必须在0-100之间: {value}")
+                                    continue
+                            except (ValueError, TypeError):
+                                print(f"⚠️ 佣金比例必须是有效数字: {value}")
+                                continue
+                    
                     update_fields.append(f"{field} = ?")
                     update_values.append(value)
             
@@ -679,7 +886,7 @@ class InventoryManager:
         Returns:
             删除成功返回True，失败返回False
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -708,7 +915,7 @@ class InventoryManager:
         Returns:
             删除成功返回True，失败返回False
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -744,7 +951,7 @@ class InventoryManager:
         Returns:
             删除成功返回True，失败返回False
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -773,7 +980,7 @@ class InventoryManager:
         Returns:
             删除成功返回True，失败返回False
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
@@ -796,7 +1003,7 @@ class InventoryManager:
                           contact_person: Optional[str] = None, contact_phone: Optional[str] = None,
                           commission_rate: float = 0, payment_terms: Optional[str] = None) -> int:
         """添加销售渠道"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -814,7 +1021,7 @@ class InventoryManager:
     
     def get_active_risk_rules(self) -> List[Dict]:
         """获取启用的风控规则"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -834,28 +1041,35 @@ class InventoryManager:
         conn.close()
         return rules
     
-    def check_inventory_risk(self, inventory_id: int) -> Dict:
+    def check_inventory_risk(self, inventory_id: int, inventory_row: Optional[Dict] = None) -> Dict:
         """
         检查库存商品的风控合规性
         
+        Args:
+            inventory_id: 库存ID
+            inventory_row: 已通过get_inventory_with_brand读取的库存数据，提供时不再查询数据库
+        
         Returns:
             {'passed': bool, 'violations': List[str], 'suggestions': List[str]}
         """
-        conn = sqlite3.connect(self.db_path)
-        
-        # 获取库存信息
-        inventory_df = pd.read_sql_query('''
-            SELECT i.*, b.brand_name, b.reputation_score, b.brand_type
-            FROM inventory i
-            JOIN brands b ON i.brand_id = b.id
-            WHERE i.id = ?
-        ''', conn, params=(inventory_id,))
-        
-        if inventory_df.empty:
+        if inventory_row is not None:
+            inventory = pd.Series(inventory_row)
+        else:
+            conn = self._connect()
+            
+            # 获取库存信息
+            inventory_df = pd.read_sql_query('''
+                SELECT i.*, b.brand_name, b.reputation_score, b.brand_type
+                FROM inventory i
+                JOIN brands b ON i.brand_id = b.id
+                WHERE i.id = ?
+            ''', conn, params=(inventory_id,))
             conn.close()
-            return {'passed': False, 'violations': ['库存记录不存在'], 'suggestions': []}
-        
-        inventory = inventory_df.iloc[0]
+            
+            if inventory_df.empty:
+                return {'passed': False, 'violations': ['库存记录不存在'], 'suggestions': []}
+            
+            inventory = inventory_df.iloc[0]
         violations = []
         suggestions = []
         
@@ -889,8 +1103,6 @@ class InventoryManager:
                 # 这里需要结合定价计算器的结果
                 pass
         
-        conn.close()
-        
         return {
             'passed': len(violations) == 0,
             'violations': violations,
@@ -899,7 +1111,7 @@ class InventoryManager:
     
     def get_inventory_summary(self) -> Dict:
         """获取库存概览"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         
         # 库存统计
         inventory_stats = pd.read_sql_query('''
@@ -941,6 +1153,21 @@ class InventoryManager:
             'brand_stats': brand_stats.to_dict('records')
         }
     
+    def get_inventory_totals(self) -> Tuple[int, float]:
+        """
+        获取库存总计（与get_inventory_summary中按状态分组的各项之和一致）
+        
+        Returns:
+            (库存记录数, 原始价值合计)
+        """
+        conn = self._connect()
+        total_count, total_value = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(original_value), 0) FROM inventory'
+        ).fetchone()
+        conn.close()
+        
+        return total_count, total_value
+    
     def get_inventory_by_id(self, inventory_id: int) -> Optional[Dict]:
         """
         根据ID获取库存商品信息
@@ -951,7 +1178,8 @@ class InventoryManager:
         Returns:
             库存商品信息字典，不存在返回None
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row  # 按列名取值，结果中包含brand_name
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -967,17 +1195,30 @@ class InventoryManager:
         if not row:
             return None
         
-        # 获取列名
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('PRAGMA table_info(inventory)')
-        columns = [column[1] for column in cursor.fetchall()]
+        return dict(row)
+    
+    def get_inventory_with_brand(self, inventory_id: int) -> Optional[Dict]:
+        """
+        一次JOIN读取库存及其品牌信息，供风控检查、定价和财务测算共用
+        
+        Args:
+            inventory_id: 库存ID
+            
+        Returns:
+            库存字段加 brand_name、reputation_score、brand_type 的字典，
+            库存不存在或没有关联品牌时返回None
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        row = conn.execute('''
+            SELECT i.*, b.brand_name, b.reputation_score, b.brand_type
+            FROM inventory i
+            JOIN brands b ON i.brand_id = b.id
+            WHERE i.id = ?
+        ''', (inventory_id,)).fetchone()
         conn.close()
         
-        # 添加品牌名称到结果中
-        result = dict(zip(columns, row[:-1]))  # 排除最后一列的brand_name
-        result['brand_name'] = row[-1]  # 添加品牌名称
-        return result
+        return dict(row) if row else None
     
     def get_brand_by_id(self, brand_id: int) -> Optional[Dict]:
         """
@@ -989,7 +1230,7 @@ class InventoryManager:
         Returns:
             品牌方信息字典，不存在返回None
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         cursor.execute('SELECT * FROM brands WHERE id = ?', (brand_id,))
@@ -1007,6 +1248,54 @@ class InventoryManager:
         
         return dict(zip(columns, row))
     
+    def exists_bulk(self, checks: List[Tuple[str, int]]) -> Dict[str, bool]:
+        """
+        一次查询批量检查多条记录是否存在
+        
+        Args:
+            checks: (表名, 记录ID) 列表，如 [('inventory', 1), ('brands', 2)]
+        
+        Returns:
+            {表名: 是否存在} 字典
+        """
+        allowed_tables = ['inventory', 'brands', 'media_resources', 'sales_channels', 'transactions']
+        
+        for table, _ in checks:
+            if table not in allowed_tables:
+                raise ValueError(f"不支持的表名: {table}")
+        
+        if not checks:
+            return {}
+        
+        subqueries = ', '.join(f'EXISTS(SELECT 1 FROM {table} WHERE id = ?)' for table, _ in checks)
+        
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        cursor.execute(f'SELECT {subqueries}', [record_id for _, record_id in checks])
+        row = cursor.fetchone()
+        
+        conn.close()
+        
+        return {table: bool(found) for (table, _), found in zip(checks, row)}
+    
+    def inventory_exists(self, inventory_id: int) -> bool:
+        """
+        检查库存记录是否存在（单条EXISTS查询，不读取整行）
+        
+        Args:
+            inventory_id: 库存ID
+            
+        Returns:
+            存在返回True
+        """
+        conn = self._connect()
+        found = conn.execute('SELECT EXISTS(SELECT 1 FROM inventory WHERE id = ?)',
+                             (inventory_id,)).fetchone()[0]
+        conn.close()
+        
+        return bool(found)
+    
     def get_all_inventory(self) -> List[Dict]:
         """
         获取所有库存商品信息
@@ -1014,7 +1303,7 @@ class InventoryManager:
         Returns:
             库存商品信息列表
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         
         df = pd.read_sql_query('''
             SELECT i.*, b.brand_name
@@ -1027,6 +1316,36 @@ class InventoryManager:
         
         return df.to_dict('records')
     
+    def count_inventory(self) -> int:
+        """
+        统计库存商品数量
+        
+        Returns:
+            库存记录数
+        """
+        conn = self._connect()
+        count = conn.execute('SELECT COUNT(*) FROM inventory').fetchone()[0]
+        conn.close()
+        
+        return count
+    
+    def get_first_inventory(self) -> Optional[Dict]:
+        """
+        获取最新的一条库存（与get_all_inventory的第一项相同），只取ID和商品名称
+        
+        Returns:
+            包含id和product_name的字典，没有库存时返回None
+        """
+        conn = self._connect()
+        row = conn.execute(
+            'SELECT id, product_name FROM inventory ORDER BY created_at DESC LIMIT 1'
+        ).fetchone()
+        conn.close()
+        
+        if row:
+            return {'id': row[0], 'product_name': row[1]}
+        return None
+    
     def get_all_brands(self) -> List[Dict]:
         """
         获取所有品牌方信息
@@ -1034,7 +1353,7 @@ class InventoryManager:
         Returns:
             品牌方信息列表
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         
         df = pd.read_sql_query('SELECT * FROM brands ORDER BY created_at DESC', conn)
         
@@ -1042,12 +1361,89 @@ class InventoryManager:
         
         return df.to_dict('records')
     
+    def get_startup_snapshot(self) -> Dict[str, List[Dict]]:
+        """
+        一次性获取启动所需的库存和品牌数据
+        
+        两张表列结构不同，无法直接UNION ALL，这里共用同一个连接读取，
+        避免分别调用get_all_inventory/get_all_brands时重复打开数据库和经过pandas转换
+        
+        Returns:
+            {'inventory': 库存商品信息列表, 'brands': 品牌方信息列表}
+        """
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        
+        inventory = [dict(row) for row in conn.execute('''
+            SELECT i.*, b.brand_name
+            FROM inventory i
+            LEFT JOIN brands b ON i.brand_id = b.id
+            ORDER BY i.created_at DESC
+        ''')]
+        brands = [dict(row) for row in conn.execute('SELECT * FROM brands ORDER BY created_at DESC')]
+        
+        conn.close()
+        
+        return {'inventory': inventory, 'brands': brands}
+    
+    def backup_to_memory(self) -> sqlite3.Connection:
+        """
+        将数据库整体复制到内存，供连续的只读验证查询使用
+        
+        Returns:
+            内存数据库连接，使用完毕后由调用方关闭
+        """
+        disk_conn = self._connect()
+        mem_conn = sqlite3.connect(':memory:')
+        disk_conn.backup(mem_conn)
+        disk_conn.close()
+        
+        return mem_conn
+    
+    def export_to_csv(self, path_or_buf: Union[str, IO[str], None] = None) -> Union[str, IO[str]]:
+        """
+        导出库存数据到CSV（仅库存表，含品牌名称；比export_to_excel轻量）
+        
+        Args:
+            path_or_buf: 文件路径或文本缓冲区（如io.StringIO），未指定时按当前时间生成文件名
+            
+        Returns:
+            写入的文件路径或传入的缓冲区
+        """
+        if path_or_buf is None:
+            path_or_buf = f"inventory_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        
+        conn = self._connect()
+        cursor = conn.execute('''
+            SELECT i.*, b.brand_name
+            FROM inventory i
+            LEFT JOIN brands b ON i.brand_id = b.id
+        ''')
+        header = [column[0] for column in cursor.description]
+        
+        def write_rows(f):
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(cursor)
+        
+        try:
+            if isinstance(path_or_buf, str):
+                # utf-8-sig 便于Excel直接打开中文内容
+                with open(path_or_buf, 'w', newline='', encoding='utf-8-sig') as f:
+                    write_rows(f)
+            else:
+                write_rows(path_or_buf)
+        finally:
+            conn.close()
+        
+        return path_or_buf
+    
     def export_to_excel(self, filename: str = None) -> str:
         """导出数据到Excel文件"""
         if not filename:
             filename = f"inventory_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         
         # 导出各个表的数据
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
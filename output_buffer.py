@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试脚本共用的输出工具
+"""
+
+import contextlib
+import functools
+import io
+import sys
+
+def buffered_output(func):
+    """
+    非交互终端（CI、pytest捕获）下先缓存测试函数的全部输出，结束时一次性写出
+    
+    交互终端保持逐行输出；测试抛出异常时缓存内容同样会写出
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if sys.stdout.isatty():
+            return func(*args, **kwargs)
+        
+        buffer = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buffer):
+                return func(*args, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+    return wrapper
@@ -11,20 +11,21 @@ import time
 import random
 from datetime import datetime
 from typing import Dict, List, Optional
-import sqlite3
 import pandas as pd
 
+from inventory_manager import connect_db, resolve_db_path
+
 class PricingCalculator:
     """定价计算器类"""
     
-    def __init__(self, db_path: str = "inventory.db"):
+    def __init__(self, db_path: Optional[str] = None):
         """
         初始化定价计算器
         
         Args:
-            db_path: 数据库文件路径
+            db_path: 数据库文件路径或SQLite URI，未指定时与InventoryManager一致
         """
-        self.db_path = db_path
+        self.db_path = resolve_db_path(db_path)
         self.session = requests.Session()
         
         # 设置请求头，模拟真实浏览器
@@ -132,10 +133,16 @@ class PricingCalculator:
             'recommended_price': recommended_price
         }
     
-    def calculate_realization_value(self, inventory_id: int) -> Dict:
+    def calculate_realization_value(self, inventory_id: int,
+                                    inventory_row: Optional[Dict] = None) -> Dict:
         """
         计算库存商品的实际变现价值
         
+        Args:
+            inventory_id: 库存ID
+            inventory_row: 已通过InventoryManager.get_inventory_with_brand读取的库存数据，
+                           提供时不再查询库存
+        
         Returns:
             {
                 'inventory_id': int,
@@ -149,27 +156,30 @@ class PricingCalculator:
                 'risk_level': str                # 风险等级
             }
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_db(self.db_path)
         
         # 获取库存信息
-        try:
-            inventory_df = pd.read_sql_query('''
-                SELECT i.*, b.brand_name, b.reputation_score
-                FROM inventory i
-                JOIN brands b ON i.brand_id = b.id
-                WHERE i.id = ?
-            ''', conn, params=(inventory_id,))
-            
-            if inventory_df.empty:
+        if inventory_row is not None:
+            inventory = pd.Series(inventory_row)
+        else:
+            try:
+                inventory_df = pd.read_sql_query('''
+                    SELECT i.*, b.brand_name, b.reputation_score
+                    FROM inventory i
+                    JOIN brands b ON i.brand_id = b.id
+                    WHERE i.id = ?
+                ''', conn, params=(inventory_id,))
+                
+                if inventory_df.empty:
+                    conn.close()
+                    print(f"⚠️ 定价计算器：库存记录不存在，ID: {inventory_id}")
+                    return {'error': f'库存记录不存在，ID: {inventory_id}'}
+            except Exception as e:
                 conn.close()
-                print(f"⚠️ 定价计算器：库存记录不存在，ID: {inventory_id}")
-                return {'error': f'库存记录不存在，ID: {inventory_id}'}
-        except Exception as e:
-            conn.close()
-            print(f"❌ 定价计算器：获取库存信息失败，ID: {inventory_id}, 错误: {str(e)}")
-            return {'error': f'获取库存信息失败: {str(e)}'}
-        
-        inventory = inventory_df.iloc[0]
+                print(f"❌ 定价计算器：获取库存信息失败，ID: {inventory_id}, 错误: {str(e)}")
+                return {'error': f'获取库存信息失败: {str(e)}'}
+            
+            inventory = inventory_df.iloc[0]
         
         # 获取市场价格
         price_info = self.get_market_price_range(inventory['product_name'])
@@ -305,7 +315,7 @@ class PricingCalculator:
         Returns:
             报告文件路径
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = connect_db(self.db_path)
         
         if inventory_ids:
             # 获取指定库存
@@ -6,8 +6,59 @@
 
 import streamlit as st
 import pandas as pd
-import sqlite3
-from inventory_manager import InventoryManager
+from inventory_manager import InventoryManager, connect_db
+
+@st.cache_data(ttl=300)
+def load_brands(db_path: str, brands_version: int) -> dict:
+    """
+    加载品牌ID到品牌名称的映射
+    
+    品牌数据变动较少，与库存分开缓存；新增或修改品牌后递增brands_version使缓存失效。
+    db_path取自管理器，与页面写入的数据库保持一致
+    """
+    conn = connect_db(db_path)
+    brands = {row[0]: row[1] for row in conn.execute('SELECT id, brand_name FROM brands').fetchall()}
+    conn.close()
+    return brands
+
+# 库存缓存的有效期（秒）。主程序或命令行工具对同一数据库的修改不会使缓存失效，
+# 最迟在此时间后显示
+INVENTORY_TTL = 30
+
+@st.cache_data(ttl=INVENTORY_TTL)
+def load_inventory(db_path: str, inv_version: int) -> pd.DataFrame:
+    """
+    加载库存数据（不关联品牌表，品牌名称由load_brands的映射补充）
+    
+    库存发生增删改后须调用refresh_inventory()：递增inv_version并清除本函数及
+    index_inventory_by_name的缓存，重跑时只重新查询库存，品牌映射仍走缓存。
+    其他程序的修改最多延迟INVENTORY_TTL秒显示，点击“检查数据库状态”可立即刷新
+    """
+    conn = connect_db(db_path)
+    inventory_df = pd.read_sql_query('''
+        SELECT * FROM inventory
+        ORDER BY created_at DESC
+    ''', conn)
+    conn.close()
+    return inventory_df
+
+@st.cache_data(ttl=INVENTORY_TTL)
+def index_inventory_by_name(db_path: str, inv_version: int) -> dict:
+    """
+    按商品名称索引库存记录，避免每次重跑都对DataFrame做整列比较
+    
+    同名商品只保留最新的一条（与列表排序一致）
+    """
+    by_name = {}
+    for row in load_inventory(db_path, inv_version).to_dict('records'):
+        by_name.setdefault(row['product_name'], row)
+    return by_name
+
+def refresh_inventory():
+    """库存变更后使库存相关缓存失效"""
+    st.session_state['inv_version'] += 1
+    load_inventory.clear()
+    index_inventory_by_name.clear()
 
 def main():
     st.title("🔧 简化测试界面 - 验证删除和修改功能")
@@ -15,17 +66,18 @@ def main():
     # 创建管理器
     manager = InventoryManager()
     
+    # 数据版本号，用于控制缓存失效
+    st.session_state.setdefault('inv_version', 0)
+    st.session_state.setdefault('brands_version', 0)
+    
     st.header("当前库存数据")
     
     # 获取库存数据
-    conn = sqlite3.connect("inventory.db")
+    conn = connect_db(manager.db_path)
     try:
-        inventory_df = pd.read_sql_query('''
-            SELECT i.*, b.brand_name 
-            FROM inventory i
-            LEFT JOIN brands b ON i.brand_id = b.id
-            ORDER BY i.created_at DESC
-        ''', conn)
+        brands = load_brands(manager.db_path, st.session_state['brands_version'])
+        inventory_df = load_inventory(manager.db_path, st.session_state['inv_version'])
+        inventory_df['brand_name'] = inventory_df['brand_id'].map(brands)
         
         if inventory_df.empty:
             st.warning("暂无库存数据，请先添加一些数据")
@@ -43,6 +95,8 @@ def main():
                         original_value=1000.0
                     )
                     st.success(f"添加测试数据成功！库存ID: {inventory_id}")
+                    st.session_state['brands_version'] += 1
+                    refresh_inventory()
                     st.rerun()
                 except Exception as e:
                     st.error(f"添加测试数据失败: {str(e)}")
@@ -54,13 +108,14 @@ def main():
         st.header("测试操作")
         
         # 选择商品
+        by_name = index_inventory_by_name(manager.db_path, st.session_state['inv_version'])
         selected_product = st.selectbox(
             "选择要操作的商品",
-            inventory_df['product_name'].tolist()
+            list(by_name)
         )
         
         if selected_product:
-            product_info = inventory_df[inventory_df['product_name'] == selected_product].iloc[0]
+            product_info = by_name[selected_product]
             product_id = int(product_info['id'])
             
             st.info(f"""
@@ -92,6 +147,7 @@ def main():
                             st.success("✅ 更新成功！")
                             st.balloons()
                             # 强制刷新数据
+                            refresh_inventory()
                             st.rerun()
                         else:
                             st.error("❌ 更新失败")
@@ -114,6 +170,7 @@ def main():
                             st.success("✅ 删除成功！")
                             st.balloons()
                             # 强制刷新数据
+                            refresh_inventory()
                             st.rerun()
                         else:
                             st.error("❌ 删除失败")
@@ -125,6 +182,8 @@ def main():
             st.header("直接数据库验证")
             
             if st.button("检查数据库状态"):
+                # 同时丢弃库存缓存，下次重跑时列表也显示数据库的最新状态
+                refresh_inventory()
                 try:
                     # 直接查询数据库
                     check_df = pd.read_sql_query(f'SELECT * FROM inventory WHERE id = {product_id}', conn)
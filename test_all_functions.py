@@ -6,12 +6,10 @@
 
 from inventory_manager import InventoryManager
 
-def test_comprehensive_functionality():
+def test_comprehensive_functionality(manager):
     """综合测试所有功能"""
     print("=== 综合功能测试 ===")
     
-    manager = InventoryManager()
-    
     # 测试1: 添加测试数据
     print("\n1. 添加测试数据...")
     brand_id = manager.add_brand("测试品牌综合", "测试联系人", "13800138000", "test@example.com", "饮料", 8)
@@ -94,15 +92,12 @@ def test_comprehensive_functionality():
     # 测试4: 验证删除
     print("\n4. 验证删除结果...")
     
-    # 检查库存是否已删除
-    remaining_inventory = manager.get_inventory_by_id(inventory_id)
-    print(f"{'✅' if remaining_inventory is None else '❌'} 库存验证删除: {remaining_inventory is None}")
-    
-    # 检查品牌是否还存在（品牌删除需要没有关联库存）
-    remaining_brand = manager.get_brand_by_id(brand_id)
-    print(f"{'✅' if remaining_brand is not None else '❌'} 品牌仍然存在: {remaining_brand is not None}")
+    # 一次查询同时检查库存是否已删除、品牌是否还存在（品牌删除需要没有关联库存）
+    exists = manager.exists_bulk([('inventory', inventory_id), ('brands', brand_id)])
+    print(f"{'✅' if not exists['inventory'] else '❌'} 库存验证删除: {not exists['inventory']}")
+    print(f"{'✅' if exists['brands'] else '❌'} 品牌仍然存在: {exists['brands']}")
     
     print("\n=== 测试完成 ===")
 
 if __name__ == "__main__":
-    test_comprehensive_functionality()
\ No newline at end of file
+    test_comprehensive_functionality(InventoryManager())
\ No newline at end of file
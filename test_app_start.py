@@ -4,22 +4,25 @@
 测试应用程序启动
 """
 
-import streamlit as st
 from inventory_manager import InventoryManager
 
-# 初始化管理器
-manager = InventoryManager()
+def test_app_start(manager):
+    """测试应用启动所需数据能否正常加载"""
+    # 一次性获取库存和品牌数据
+    snapshot = manager.get_startup_snapshot()
+    inventory_data = snapshot['inventory']
+    
+    print(f"库存数据数量: {len(inventory_data)}")
+    if inventory_data:
+        print("第一个库存项目:")
+        print(inventory_data[0])
+    
+    # 品牌数据
+    brands_data = snapshot['brands']
+    print(f"品牌数据数量: {len(brands_data)}")
+    
+    print("应用程序可以正常启动！")
 
-# 获取库存数据
-inventory_data = manager.get_all_inventory()
-
-print(f"库存数据数量: {len(inventory_data)}")
-if inventory_data:
-    print("第一个库存项目:")
-    print(inventory_data[0])
-
-# 获取品牌数据
-brands_data = manager.get_all_brands()
-print(f"品牌数据数量: {len(brands_data)}")
-
-print("应用程序可以正常启动！")
\ No newline at end of file
+if __name__ == "__main__":
+    # 初始化管理器
+    test_app_start(InventoryManager())
\ No newline at end of file
@@ -9,14 +9,39 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import pytest
+
 from inventory_manager import InventoryManager
+from output_buffer import buffered_output
 
-def test_inventory_update_edge_cases():
+@pytest.fixture(scope="module")
+def edge_inventory_id(manager):
+    """边界测试共用的库存记录"""
+    brand_id = manager.add_brand(brand_name="测试品牌", brand_type="饮料", reputation_score=8)
+    return manager.add_inventory(
+        brand_id=brand_id,
+        product_name="测试商品",
+        category="饮料",
+        quantity=100,
+        original_value=5000.0
+    )
+
+@pytest.mark.parametrize("use_valid_id, kwargs", [
+    (True, {'quantity': -10}),                    # 负数数量
+    (True, {'original_value': 'abc'}),            # 无效数值
+    (True, {'unknown_field': '值'}),              # 不允许的字段
+    (False, {'product_name': '不存在的商品'}),     # 不存在的ID
+])
+def test_inventory_update_rejected(manager, edge_inventory_id, use_valid_id, kwargs):
+    """无效的库存更新应该被拒绝"""
+    inventory_id = edge_inventory_id if use_valid_id else 99999
+    assert manager.update_inventory(inventory_id, **kwargs) is False
+
+@buffered_output
+def test_inventory_update_edge_cases(manager):
     """测试库存更新的边界情况"""
     print("🧪 测试库存更新的边界情况...")
     
-    manager = InventoryManager()
-    
     # 添加测试品牌
     brand_id = manager.add_brand(
         brand_name="测试品牌",
@@ -47,24 +72,28 @@ def test_inventory_update_edge_cases():
         storage_location=None,
         market_value=None
     )
-    print(f"✅ None值更新{'成功' if success else '失败'}")
+    assert success, "None值更新失败"
+    print("✅ None值更新成功")
     
     # 验证更新结果
     updated_data = manager.get_inventory_by_id(inventory_id)
     print(f"   存储位置: {updated_data.get('storage_location')}")
     print(f"   市场价值: {updated_data.get('market_value')}")
+    assert updated_data['storage_location'] is None and updated_data['market_value'] is None, f"None值未写入: {updated_data}"
     
-    # 测试2: 更新为0值（应该转换为None）
-    print("\n2. 测试将市场价值更新为0（应该转换为None）...")
+    # 测试2: 更新为0值（0是有效金额，应保存为0而不是None）
+    print("\n2. 测试将市场价值更新为0（应保存为0）...")
     success = manager.update_inventory(
         inventory_id,
         market_value=0.0
     )
-    print(f"✅ 0值更新{'成功' if success else '失败'}")
+    assert success, "0值更新失败"
+    print("✅ 0值更新成功")
     
     # 验证更新结果
     updated_data = manager.get_inventory_by_id(inventory_id)
     print(f"   市场价值: {updated_data.get('market_value')}")
+    assert updated_data['market_value'] == 0.0, f"0值未按原值保存: {updated_data}"
     
     # 测试3: 更新为负数（应该被拒绝）
     print("\n3. 测试将数量更新为负数（应该被拒绝）...")
@@ -72,7 +101,8 @@ def test_inventory_update_edge_cases():
         inventory_id,
         quantity=-10
     )
-    print(f"✅ 负数更新{'被拒绝' if not success else '意外成功'}")
+    assert not success, "负数更新意外成功"
+    print("✅ 负数更新被拒绝")
     
     # 测试4: 更新为无效ID
     print("\n4. 测试更新不存在的库存ID...")
@@ -80,7 +110,8 @@ def test_inventory_update_edge_cases():
         99999,  # 不存在的ID
         product_name="不存在的商品"
     )
-    print(f"✅ 无效ID更新{'被拒绝' if not success else '意外成功'}")
+    assert not success, "无效ID更新意外成功"
+    print("✅ 无效ID更新被拒绝")
     
     # 测试5: 更新为空字符串（应该转换为None）
     print("\n5. 测试将存储位置更新为空字符串（应该转换为None）...")
@@ -88,20 +119,19 @@ def test_inventory_update_edge_cases():
         inventory_id,
         storage_location=""
     )
-    print(f"✅ 空字符串更新{'成功' if success else '失败'}")
+    assert success, "空字符串更新失败"
+    print("✅ 空字符串更新成功")
     
     # 验证更新结果
     updated_data = manager.get_inventory_by_id(inventory_id)
     print(f"   存储位置: '{updated_data.get('storage_location')}'")
-    
-    return True
+    assert updated_data['storage_location'] is None, f"空字符串未转换为None: {updated_data}"
 
-def test_brand_update_edge_cases():
+@buffered_output
+def test_brand_update_edge_cases(manager):
     """测试品牌更新的边界情况"""
     print("\n🧪 测试品牌更新的边界情况...")
     
-    manager = InventoryManager()
-    
     # 添加测试品牌
     brand_id = manager.add_brand(
         brand_name="测试品牌",
@@ -120,7 +150,8 @@ def test_brand_update_edge_cases():
         brand_id,
         reputation_score=15  # 超出1-10范围
     )
-    print(f"✅ 无效信誉评分更新{'被拒绝' if not success else '意外成功'}")
+    assert not success, "无效信誉评分更新意外成功"
+    print("✅ 无效信誉评分更新被拒绝")
     
     # 测试2: 更新为空字符串（应该转换为None）
     print("\n2. 测试将联系人更新为空字符串（应该转换为None）...")
@@ -128,11 +159,13 @@ def test_brand_update_edge_cases():
         brand_id,
         contact_person=""
     )
-    print(f"✅ 空字符串更新{'成功' if success else '失败'}")
+    assert success, "空字符串更新失败"
+    print("✅ 空字符串更新成功")
     
     # 验证更新结果
     updated_data = manager.get_brand_by_id(brand_id)
     print(f"   联系人: '{updated_data.get('contact_person')}'")
+    assert updated_data['contact_person'] is None, f"空字符串未转换为None: {updated_data}"
     
     # 测试3: 更新为有效值
     print("\n3. 测试更新为有效值...")
@@ -141,21 +174,21 @@ def test_brand_update_edge_cases():
         brand_name="更新后的品牌名称",
         reputation_score=9
     )
-    print(f"✅ 有效值更新{'成功' if success else '失败'}")
+    assert success, "有效值更新失败"
+    print("✅ 有效值更新成功")
     
     # 验证更新结果
     updated_data = manager.get_brand_by_id(brand_id)
     print(f"   品牌名称: {updated_data.get('brand_name')}")
     print(f"   信誉评分: {updated_data.get('reputation_score')}")
-    
-    return True
+    actual = (updated_data['brand_name'], updated_data['reputation_score'])
+    assert actual == ("更新后的品牌名称", 9), f"字段修改不正确: {updated_data}"
 
-def test_media_resource_update():
+@buffered_output
+def test_media_resource_update(manager):
     """测试媒体资源更新"""
     print("\n🧪 测试媒体资源更新...")
     
-    manager = InventoryManager()
-    
     # 添加测试媒体资源
     media_id = manager.add_media_resource(
         media_name="测试媒体",
@@ -175,7 +208,8 @@ def test_media_resource_update():
         media_id,
         discount_rate=150.0  # 超过100%
     )
-    print(f"✅ 无效折扣率更新{'被拒绝' if not success else '意外成功'}")
+    assert not success, "无效折扣率更新意外成功"
+    print("✅ 无效折扣率更新被拒绝")
     
     # 测试2: 更新为负数（应该被拒绝）
     print("\n2. 测试将刊例价更新为负数（应该被拒绝）...")
@@ -183,7 +217,8 @@ def test_media_resource_update():
         media_id,
         market_price=-1000.0
     )
-    print(f"✅ 负数价格更新{'被拒绝' if not success else '意外成功'}")
+    assert not success, "负数价格更新意外成功"
+    print("✅ 负数价格更新被拒绝")
     
     # 测试3: 更新为有效值
     print("\n3. 测试更新为有效值...")
@@ -193,19 +228,17 @@ def test_media_resource_update():
         market_price=6000.0,
         status="occupied"
     )
-    print(f"✅ 有效值更新{'成功' if success else '失败'}")
+    assert success, "有效值更新失败"
+    print("✅ 有效值更新成功")
     
     # 验证更新结果
     # 这里需要添加获取媒体资源的方法，暂时跳过验证
-    
-    return True
 
-def test_sales_channel_update():
+@buffered_output
+def test_sales_channel_update(manager):
     """测试销售渠道更新"""
     print("\n🧪 测试销售渠道更新...")
     
-    manager = InventoryManager()
-    
     # 添加测试销售渠道
     channel_id = manager.add_sales_channel(
         channel_name="测试渠道",
@@ -224,7 +257,8 @@ def test_sales_channel_update():
         channel_id,
         commission_rate=150.0  # 超过100%
     )
-    print(f"✅ 无效佣金比例更新{'被拒绝' if not success else '意外成功'}")
+    assert not success, "无效佣金比例更新意外成功"
+    print("✅ 无效佣金比例更新被拒绝")
     
     # 测试2: 更新为负数（应该被拒绝）
     print("\n2. 测试将佣金比例更新为负数（应该被拒绝）...")
@@ -232,7 +266,8 @@ def test_sales_channel_update():
         channel_id,
         commission_rate=-5.0
     )
-    print(f"✅ 负数佣金比例更新{'被拒绝' if not success else '意外成功'}")
+    assert not success, "负数佣金比例更新意外成功"
+    print("✅ 负数佣金比例更新被拒绝")
     
     # 测试3: 更新为空字符串（应该转换为None）
     print("\n3. 测试将联系人更新为空字符串（应该转换为None）...")
@@ -240,7 +275,8 @@ def test_sales_channel_update():
         channel_id,
         contact_person=""
     )
-    print(f"✅ 空字符串更新{'成功' if success else '失败'}")
+    assert success, "空字符串更新失败"
+    print("✅ 空字符串更新成功")
     
     # 测试4: 更新为有效值
     print("\n4. 测试更新为有效值...")
@@ -249,9 +285,8 @@ def test_sales_channel_update():
         channel_name="更新后的渠道名称",
         commission_rate=8.0
     )
-    print(f"✅ 有效值更新{'成功' if success else '失败'}")
-    
-    return True
+    assert success, "有效值更新失败"
+    print("✅ 有效值更新成功")
 
 def main():
     """主测试函数"""
@@ -260,35 +295,36 @@ def main():
     print("="*80)
     
     test_results = []
+    manager = InventoryManager()
     
     # 测试库存更新边界情况
     try:
-        result = test_inventory_update_edge_cases()
-        test_results.append(("库存更新边界测试", result))
+        test_inventory_update_edge_cases(manager)
+        test_results.append(("库存更新边界测试", True))
     except Exception as e:
         print(f"❌ 库存更新边界测试失败: {e}")
         test_results.append(("库存更新边界测试", False))
     
     # 测试品牌更新边界情况
     try:
-        result = test_brand_update_edge_cases()
-        test_results.append(("品牌更新边界测试", result))
+        test_brand_update_edge_cases(manager)
+        test_results.append(("品牌更新边界测试", True))
     except Exception as e:
         print(f"❌ 品牌更新边界测试失败: {e}")
         test_results.append(("品牌更新边界测试", False))
     
     # 测试媒体资源更新
     try:
-        result = test_media_resource_update()
-        test_results.append(("媒体资源更新测试", result))
+        test_media_resource_update(manager)
+        test_results.append(("媒体资源更新测试", True))
     except Exception as e:
         print(f"❌ 媒体资源更新测试失败: {e}")
         test_results.append(("媒体资源更新测试", False))
     
     # 测试销售渠道更新
     try:
-        result = test_sales_channel_update()
-        test_results.append(("销售渠道更新测试", result))
+        test_sales_channel_update(manager)
+        test_results.append(("销售渠道更新测试", True))
     except Exception as e:
         print(f"❌ 销售渠道更新测试失败: {e}")
         test_results.append(("销售渠道更新测试", False))
@@ -6,12 +6,10 @@
 
 from inventory_manager import InventoryManager
 
-def test_delete_functionality():
+def test_delete_functionality(manager):
     """测试删除功能"""
     print("=== 测试删除功能 ===")
     
-    manager = InventoryManager()
-    
     # 获取当前库存列表
     inventory_list = manager.get_all_inventory()
     print(f"当前库存数量: {len(inventory_list)}")
@@ -33,12 +31,14 @@ def test_delete_functionality():
         if success:
             print(f"✅ 删除成功: ID={test_id}")
             
-            # 验证删除
-            remaining_list = manager.get_all_inventory()
-            print(f"删除后库存数量: {len(remaining_list)}")
+            # 验证删除：复制一份内存快照，所有检查都在快照上完成
+            snapshot = manager.backup_to_memory()
+            remaining_count = snapshot.execute('SELECT COUNT(*) FROM inventory').fetchone()[0]
+            print(f"删除后库存数量: {remaining_count}")
             
             # 检查是否真的没有这个ID了
-            deleted_item = manager.get_inventory_by_id(test_id)
+            deleted_item = snapshot.execute('SELECT 1 FROM inventory WHERE id = ?', (test_id,)).fetchone()
+            snapshot.close()
             if deleted_item is None:
                 print(f"✅ 确认删除: ID={test_id} 已不存在")
             else:
@@ -52,12 +52,10 @@ def test_delete_functionality():
         import traceback
         traceback.print_exc()
 
-def test_update_functionality():
+def test_update_functionality(manager):
     """测试更新功能"""
     print("\n=== 测试更新功能 ===")
     
-    manager = InventoryManager()
-    
     # 获取当前库存列表
     inventory_list = manager.get_all_inventory()
     
@@ -99,5 +97,6 @@ def test_update_functionality():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    test_update_functionality()
-    test_delete_functionality()
\ No newline at end of file
+    manager = InventoryManager()
+    test_update_functionality(manager)
+    test_delete_functionality(manager)
\ No newline at end of file
@@ -5,21 +5,119 @@
 验证库存、媒体、渠道的删除和修改功能
 """
 
+import atexit
 import sqlite3
-import pandas as pd
-from inventory_manager import InventoryManager
 
-def test_hybrid_solution():
-    """测试混合解决方案的核心功能"""
-    print("🚀 开始测试混合解决方案...")
-    
-    # 创建管理器实例
-    manager = InventoryManager()
-    
-    # 测试1：库存管理功能
-    print("\n📦 测试库存管理功能...")
-    
-    # 添加测试品牌
+import pytest
+
+from inventory_manager import InventoryManager, connect_db, resolve_db_path
+
+# 整个测试共用一个验证连接（自动提交模式），退出时关闭
+# 调大预编译语句缓存，重复的验证SQL直接复用已编译的语句
+# 与管理器连接同一个库（pytest下为共享内存库）
+CONN = connect_db(resolve_db_path(), isolation_level=None, check_same_thread=False,
+                  cached_statements=256)
+CONN.row_factory = sqlite3.Row
+# 与管理器一致使用WAL和NORMAL同步级别，减少测试写入时的fsync
+CONN.execute("PRAGMA journal_mode=WAL")
+CONN.execute("PRAGMA synchronous=NORMAL")
+atexit.register(CONN.close)
+
+# 各实体的“添加 → 修改 → 验证 → 删除 → 验证”流程配置
+# check_fields 为修改后需要核对的字段（取自 update_kwargs）
+CRUD_SPECS = [
+    {
+        'name': 'inventory',
+        'label': '库存',
+        'title': '📦 测试库存管理功能...',
+        'table': 'inventory',
+        'add': 'add_inventory',
+        'add_kwargs': {
+            'product_name': "测试商品混合版",
+            'category': "饮料",
+            'quantity': 100,
+            'original_value': 1000.0,
+            'market_value': 1200.0,
+            'storage_location': "测试仓库"
+        },
+        'update': 'update_inventory',
+        'update_kwargs': {
+            'product_name': "修改后的商品名称",
+            'quantity': 150,
+            'original_value': 1500.0,
+            'status': "approved"
+        },
+        'check_fields': ('product_name', 'quantity'),
+        # 更新时直接返回新行，不再单独查询验证
+        'return_row': True,
+        'delete': 'delete_inventory'
+    },
+    {
+        'name': 'media',
+        'label': '媒体',
+        'title': '📺 测试媒体管理功能...',
+        'table': 'media_resources',
+        'add': 'add_media_resource',
+        'add_kwargs': {
+            'media_name': "测试媒体混合版",
+            'media_type': "社区门禁",
+            'media_form': "静态海报",
+            'location': "测试小区",
+            'market_price': 5000.0,
+            'discount_rate': 80.0,
+            'actual_cost': 4000.0
+        },
+        'update': 'update_media_resource',
+        'update_kwargs': {
+            'media_name': "修改后的媒体名称",
+            'market_price': 6000.0,
+            'status': "occupied"
+        },
+        'check_fields': ('media_name', 'market_price'),
+        'delete': 'delete_media_resource'
+    },
+    {
+        'name': 'channel',
+        'label': '渠道',
+        'title': '🛒 测试渠道管理功能...',
+        'table': 'sales_channels',
+        'add': 'add_sales_channel',
+        'add_kwargs': {
+            'channel_name': "测试渠道混合版",
+            'channel_type': "S级(团长)",
+            'contact_person': "测试团长",
+            'contact_phone': "13800138000",
+            'commission_rate': 5.0,
+            'payment_terms': "月结"
+        },
+        'update': 'update_sales_channel',
+        'update_kwargs': {
+            'channel_name': "修改后的渠道名称",
+            'commission_rate': 6.0,
+            'contact_person': "修改后的联系人"
+        },
+        'check_fields': ('channel_name', 'commission_rate'),
+        'delete': 'delete_sales_channel'
+    }
+]
+
+def fetch_one(sql, params=()):
+    """在共用连接上执行查询并返回第一行"""
+    return CONN.execute(sql, params).fetchone()
+
+def get_record(manager, table, record_id):
+    """读取一条记录，库存走管理器接口，其余表直接查询；不存在返回None"""
+    if table == 'inventory':
+        return manager.get_inventory_by_id(record_id)
+    row = fetch_one(f"SELECT * FROM {table} WHERE id = ?", (record_id,))
+    return dict(row) if row else None
+
+def record_exists(table, record_id):
+    """只判断记录是否存在，不读取整行"""
+    return fetch_one(f"SELECT 1 FROM {table} WHERE id = ? LIMIT 1", (record_id,)) is not None
+
+def add_test_brand(manager):
+    """添加测试品牌"""
     brand_id = manager.add_brand(
         brand_name="测试品牌混合版",
         contact_person="测试联系人",
@@ -28,177 +126,80 @@ def test_hybrid_solution():
         reputation_score=8
     )
     print(f"✅ 添加测试品牌成功，ID: {brand_id}")
+    return brand_id
+
+def run_crud_cycle(manager, spec, brand_id):
+    """
+    按配置执行一轮添加、修改、删除并逐步验证
     
-    # 添加测试库存
-    inventory_id = manager.add_inventory(
-        brand_id=brand_id,
-        product_name="测试商品混合版",
-        category="饮料",
-        quantity=100,
-        original_value=1000.0,
-        market_value=1200.0,
-        storage_location="测试仓库"
-    )
-    print(f"✅ 添加测试库存成功，ID: {inventory_id}")
-    
-    # 测试修改功能
-    success = manager.update_inventory(
-        inventory_id,
-        product_name="修改后的商品名称",
-        quantity=150,
-        original_value=1500.0,
-        status="approved"
-    )
-    if success:
-        print("✅ 库存修改功能正常")
-    else:
-        print("❌ 库存修改功能异常")
-    
-    # 验证修改结果
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT product_name, quantity, original_value, status FROM inventory WHERE id = ?", (inventory_id,))
-    result = cursor.fetchone()
-    conn.close()
-    
-    if result and result[0] == "修改后的商品名称" and result[1] == 150:
-        print("✅ 库存修改验证成功")
-    else:
-        print("❌ 库存修改验证失败")
-    
-    # 测试删除功能
-    success = manager.delete_inventory(inventory_id)
-    if success:
-        print("✅ 库存删除功能正常")
-    else:
-        print("❌ 库存删除功能异常")
-    
-    # 验证删除结果
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM inventory WHERE id = ?", (inventory_id,))
-    count = cursor.fetchone()[0]
-    conn.close()
-    
-    if count == 0:
-        print("✅ 库存删除验证成功")
-    else:
-        print("❌ 库存删除验证失败")
+    Returns:
+        全部步骤通过返回True
+    """
+    label = spec['label']
+    print(f"\n{spec['title']}")
     
-    # 测试2：媒体管理功能
-    print("\n📺 测试媒体管理功能...")
+    add_kwargs = dict(spec['add_kwargs'])
+    if spec['table'] == 'inventory':
+        add_kwargs['brand_id'] = brand_id
+    record_id = getattr(manager, spec['add'])(**add_kwargs)
+    print(f"✅ 添加测试{label}成功，ID: {record_id}")
     
-    # 添加测试媒体
-    media_id = manager.add_media_resource(
-        media_name="测试媒体混合版",
-        media_type="社区门禁",
-        media_form="静态海报",
-        location="测试小区",
-        market_price=5000.0,
-        discount_rate=80.0,
-        actual_cost=4000.0
-    )
-    print(f"✅ 添加测试媒体成功，ID: {media_id}")
+    results = []
     
     # 测试修改功能
-    success = manager.update_media_resource(
-        media_id,
-        media_name="修改后的媒体名称",
-        market_price=6000.0,
-        status="occupied"
-    )
-    if success:
-        print("✅ 媒体修改功能正常")
+    if spec.get('return_row'):
+        record = getattr(manager, spec['update'])(record_id, return_row=True,
+                                                  **spec['update_kwargs'])
+        success = bool(record)
     else:
-        print("❌ 媒体修改功能异常")
+        success = getattr(manager, spec['update'])(record_id, **spec['update_kwargs'])
+        record = None
+    print(f"✅ {label}修改功能正常" if success else f"❌ {label}修改功能异常")
+    results.append(success)
     
     # 验证修改结果
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT media_name, market_price, status FROM media_resources WHERE id = ?", (media_id,))
-    result = cursor.fetchone()
-    conn.close()
-    
-    if result and result[0] == "修改后的媒体名称" and result[1] == 6000.0:
-        print("✅ 媒体修改验证成功")
-    else:
-        print("❌ 媒体修改验证失败")
+    if not spec.get('return_row'):
+        record = get_record(manager, spec['table'], record_id)
+    verified = record is not None and all(
+        record[field] == spec['update_kwargs'][field] for field in spec['check_fields']
+    )
+    print(f"✅ {label}修改验证成功" if verified else f"❌ {label}修改验证失败")
+    results.append(verified)
     
     # 测试删除功能
-    success = manager.delete_media_resource(media_id)
-    if success:
-        print("✅ 媒体删除功能正常")
-    else:
-        print("❌ 媒体删除功能异常")
+    success = getattr(manager, spec['delete'])(record_id)
+    print(f"✅ {label}删除功能正常" if success else f"❌ {label}删除功能异常")
+    results.append(success)
     
     # 验证删除结果
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM media_resources WHERE id = ?", (media_id,))
-    count = cursor.fetchone()[0]
-    conn.close()
-    
-    if count == 0:
-        print("✅ 媒体删除验证成功")
-    else:
-        print("❌ 媒体删除验证失败")
-    
-    # 测试3：渠道管理功能
-    print("\n🛒 测试渠道管理功能...")
+    verified = not record_exists(spec['table'], record_id)
+    print(f"✅ {label}删除验证成功" if verified else f"❌ {label}删除验证失败")
+    results.append(verified)
     
-    # 添加测试渠道
-    channel_id = manager.add_sales_channel(
-        channel_name="测试渠道混合版",
-        channel_type="S级(团长)",
-        contact_person="测试团长",
-        contact_phone="13800138000",
-        commission_rate=5.0,
-        payment_terms="月结"
-    )
-    print(f"✅ 添加测试渠道成功，ID: {channel_id}")
-    
-    # 测试修改功能
-    success = manager.update_sales_channel(
-        channel_id,
-        channel_name="修改后的渠道名称",
-        commission_rate=6.0,
-        contact_person="修改后的联系人"
-    )
-    if success:
-        print("✅ 渠道修改功能正常")
-    else:
-        print("❌ 渠道修改功能异常")
-    
-    # 验证修改结果
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT channel_name, commission_rate, contact_person FROM sales_channels WHERE id = ?", (channel_id,))
-    result = cursor.fetchone()
-    conn.close()
-    
-    if result and result[0] == "修改后的渠道名称" and result[1] == 6.0:
-        print("✅ 渠道修改验证成功")
-    else:
-        print("❌ 渠道修改验证失败")
-    
-    # 测试删除功能
-    success = manager.delete_sales_channel(channel_id)
-    if success:
-        print("✅ 渠道删除功能正常")
-    else:
-        print("❌ 渠道删除功能异常")
+    return all(results)
+
+@pytest.fixture(scope="module")
+def hybrid_brand_id(manager):
+    """本模块共用的测试品牌，结束后清理"""
+    brand_id = add_test_brand(manager)
+    yield brand_id
+    manager.delete_brand(brand_id)
+
+@pytest.mark.parametrize("spec", CRUD_SPECS, ids=[spec['name'] for spec in CRUD_SPECS])
+def test_hybrid_solution(manager, hybrid_brand_id, spec):
+    """测试混合解决方案的核心功能"""
+    assert run_crud_cycle(manager, spec, hybrid_brand_id)
+
+def main():
+    """依次执行全部实体的测试流程"""
+    print("🚀 开始测试混合解决方案...")
     
-    # 验证删除结果
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT COUNT(*) FROM sales_channels WHERE id = ?", (channel_id,))
-    count = cursor.fetchone()[0]
-    conn.close()
+    # 创建管理器实例
+    manager = InventoryManager()
     
-    if count == 0:
-        print("✅ 渠道删除验证成功")
-    else:
-        print("❌ 渠道删除验证失败")
+    brand_id = add_test_brand(manager)
+    for spec in CRUD_SPECS:
+        run_crud_cycle(manager, spec, brand_id)
     
     # 清理测试品牌
     manager.delete_brand(brand_id)
@@ -208,4 +209,4 @@ def test_hybrid_solution():
     print("✅ 所有删除和修改功能均已验证正常")
 
 if __name__ == "__main__":
-    test_hybrid_solution()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -4,7 +4,6 @@
 测试商品链接功能
 """
 
-import sqlite3
 from inventory_manager import InventoryManager
 
 def test_link_functionality():
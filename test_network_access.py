@@ -5,32 +5,53 @@
 用于测试Streamlit应用的本地和公网访问
 """
 
+import errno
+import select
 import socket
-import requests
 import subprocess
 import platform
 import json
+import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.error import HTTPError
+from urllib.request import urlopen
 
-def get_network_info():
-    """获取网络信息"""
+def get_local_ip():
+    """获取本地局域网IP（UDP connect只选路由，不发送数据）"""
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.connect(("8.8.8.8", 80))
+        local_ip = s.getsockname()[0]
+        s.close()
+        return local_ip
+    except Exception:
+        return "127.0.0.1"
+
+@functools.lru_cache(maxsize=1)
+def get_network_info(local_ip=None):
+    """
+    获取网络信息
+    
+    结果在进程内缓存，报告中的多处调用只探测一次网络（UDP探测 + 公网IP查询）；
+    返回的字典为共享对象，调用方不应修改
+    
+    Args:
+        local_ip: 局域网IP，调用方已获取时直接传入，未传入时自行探测
+    """
     info = {}
     
     # 获取主机名
     info['hostname'] = socket.gethostname()
     
     # 获取本地IP
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        info['local_ip'] = s.getsockname()[0]
-        s.close()
-    except Exception:
-        info['local_ip'] = "127.0.0.1"
+    info['local_ip'] = local_ip or get_local_ip()
     
     # 获取公网IP
     try:
-        info['public_ip'] = requests.get('https://api.ipify.org', timeout=5).text
+        with urlopen('https://api.ipify.org', timeout=5) as response:
+            info['public_ip'] = response.read().decode()
     except:
         info['public_ip'] = "无法获取"
     
@@ -40,42 +61,100 @@ def get_network_info():
     
     return info
 
-def test_port_access(port=8501):
-    """测试端口访问"""
+# 非阻塞connect正在进行中的返回码（Windows上为WSAEWOULDBLOCK）
+CONNECT_IN_PROGRESS = (errno.EINPROGRESS, errno.EWOULDBLOCK, 10035)
+
+def probe_ports(hosts, port, timeout=2.0):
+    """
+    用非阻塞socket同时探测多个地址的TCP端口，一次select等待全部结果
+    
+    Args:
+        hosts: 标签到地址的映射，如 {'localhost': '127.0.0.1'}
+        port: 端口号
+        timeout: 等待连接结果的超时秒数
+        
+    Returns:
+        标签到 (是否可连接, 错误信息) 的映射，未发生异常时错误信息为None
+    """
+    results = {}
+    pending = {}
+    
+    for label, host in hosts.items():
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            code = sock.connect_ex((host, port))
+        except Exception as e:
+            results[label] = (False, str(e))
+            continue
+        if code in CONNECT_IN_PROGRESS:
+            pending[sock] = label
+        else:
+            results[label] = (code == 0, None)
+            sock.close()
+    
+    if pending:
+        # 连接完成（成功或失败）时socket变为可写；Windows上失败的连接出现在异常列表中
+        _, writable, failed = select.select([], list(pending), list(pending), timeout)
+        for sock, label in pending.items():
+            if sock in writable and sock not in failed:
+                connected = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+            else:
+                connected = False
+            results[label] = (connected, None)
+            sock.close()
+    
+    return results
+
+def test_port_access(port=8501, local_ip=None):
+    """
+    测试端口访问（本地和局域网两个地址同时探测）
+    
+    Args:
+        port: 端口号
+        local_ip: 局域网IP，调用方已获取时直接传入，未传入时自行探测
+    """
     results = {}
+    if local_ip is None:
+        local_ip = get_local_ip()
+    
+    probes = probe_ports({'localhost': '127.0.0.1', 'local_network': local_ip}, port)
     
     # 测试本地访问
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex(('127.0.0.1', port))
-        sock.close()
-        results['localhost'] = result == 0
-    except Exception as e:
-        results['localhost'] = False
-        results['localhost_error'] = str(e)
+    results['localhost'], error = probes['localhost']
+    if error:
+        results['localhost_error'] = error
     
     # 测试局域网IP访问
-    try:
-        local_ip = get_network_info()['local_ip']
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        result = sock.connect_ex((local_ip, port))
-        sock.close()
-        results['local_network'] = result == 0
+    results['local_network'], error = probes['local_network']
+    if error:
+        results['local_network_error'] = error
+    else:
         results['local_ip'] = local_ip
-    except Exception as e:
-        results['local_network'] = False
-        results['local_network_error'] = str(e)
     
     return results
 
+APP_TITLE = '广告置换库存管理系统'
+# 预先编码标题，直接在原始响应字节中查找，无需解码整个页面
+APP_TITLE_BYTES = APP_TITLE.encode('utf-8')
+
 def test_streamlit_response(url):
     """测试Streamlit响应"""
     try:
-        response = requests.get(url, timeout=10)
+        with urlopen(url, timeout=10) as response:
+            status_code = response.status
+            body = response.read()
         return {
-            'status_code': response.status_code,
-            'accessible': response.status_code == 200,
-            'title': '广告置换库存管理系统' if '广告置换库存管理系统' in response.text else 'Unknown'
+            'status_code': status_code,
+            'accessible': status_code == 200,
+            'title': APP_TITLE if APP_TITLE_BYTES in body else 'Unknown'
+        }
+    except HTTPError as e:
+        # 非2xx状态码，服务可达但页面异常
+        return {
+            'status_code': e.code,
+            'accessible': False,
+            'title': 'Unknown'
         }
     except Exception as e:
         return {
@@ -83,8 +162,9 @@ def test_streamlit_response(url):
             'error': str(e)
         }
 
+@functools.lru_cache(maxsize=1)
 def check_firewall_status():
-    """检查防火墙状态"""
+    """检查防火墙状态（结果在脚本运行期间缓存，netsh只调用一次）"""
     system = platform.system()
     firewall_status = {}
     
@@ -92,8 +172,7 @@ def check_firewall_status():
         try:
             # 检查Windows防火墙规则
             result = subprocess.run(
-                'netsh advfirewall firewall show rule name="Streamlit-8501"',
-                shell=True,
+                ["netsh", "advfirewall", "firewall", "show", "rule", "name=Streamlit-8501"],
                 capture_output=True,
                 text=True
             )
@@ -111,8 +190,19 @@ def generate_access_report():
     print(f"测试时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
-    # 网络信息
-    network_info = get_network_info()
+    # 网络信息（含公网IP查询）、端口探测和两个Streamlit响应测试互不依赖，并发执行；
+    # 响应测试预先发起，仅在本地端口可访问时输出结果。
+    # 局域网IP只探测一次，网络信息、端口探测和响应测试使用同一个值
+    local_ip = get_local_ip()
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        network_future = executor.submit(get_network_info, local_ip)
+        port_future = executor.submit(test_port_access, 8501, local_ip)
+        local_response_future = executor.submit(test_streamlit_response, "http://127.0.0.1:8501")
+        local_ip_response_future = executor.submit(test_streamlit_response, f"http://{local_ip}:8501")
+        
+        network_info = network_future.result()
+        port_test = port_future.result()
+    
     print("📊 网络信息:")
     print(f"  主机名: {network_info['hostname']}")
     print(f"  本地IP: {network_info['local_ip']}")
@@ -121,7 +211,6 @@ def generate_access_report():
     print()
     
     # 端口测试
-    port_test = test_port_access()
     print("🔌 端口访问测试 (端口 8501):")
     print(f"  本地访问 (127.0.0.1:8501): {'✅ 正常' if port_test['localhost'] else '❌ 失败'}")
     print(f"  局域网访问 ({network_info['local_ip']}:8501): {'✅ 正常' if port_test['local_network'] else '❌ 失败'}")
@@ -134,13 +223,13 @@ def generate_access_report():
     # Streamlit响应测试
     if port_test['localhost']:
         print("🌐 Streamlit响应测试:")
-        local_test = test_streamlit_response("http://127.0.0.1:8501")
+        local_test = local_response_future.result()
         print(f"  本地响应: {'✅ 正常' if local_test['accessible'] else '❌ 失败'}")
         if local_test['accessible']:
             print(f"  页面标题: {local_test['title']}")
         
         # 测试局域网IP
-        local_ip_test = test_streamlit_response(f"http://{network_info['local_ip']}:8501")
+        local_ip_test = local_ip_response_future.result()
         print(f"  局域网响应: {'✅ 正常' if local_ip_test['accessible'] else '❌ 失败'}")
         print()
     
@@ -187,8 +276,13 @@ def generate_access_report():
         'timestamp': datetime.now().isoformat()
     }
     
+    # 默认输出紧凑JSON供程序读取；设置环境变量PRETTY_JSON时缩进输出便于人工查看
+    if os.getenv("PRETTY_JSON"):
+        dump_options = {'indent': 2}
+    else:
+        dump_options = {'separators': (',', ':')}
     with open('network_test_report.json', 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+        json.dump(config, f, ensure_ascii=False, **dump_options)
     
     print("📄 详细报告已保存到: network_test_report.json")
 
@@ -5,8 +5,6 @@
 验证添加、修改、删除功能中的None值处理问题是否已修复
 """
 
-import sqlite3
-import pandas as pd
 from inventory_manager import InventoryManager
 from pricing_calculator import PricingCalculator
 from financial_calculator import FinancialCalculator
@@ -38,20 +36,24 @@ def test_inventory_operations():
     # 测试2: 添加库存（市场价值为None）
     print("\n2. 测试添加库存（市场价值为None）...")
     try:
-        inventory_id = manager.add_inventory(
-            brand_id=brand_id,
-            product_name="测试商品",
-            category="饮料",
-            quantity=100,
-            original_value=5000.0,
-            market_value=None,  # 测试None值
-            expiry_date=None,   # 测试None值
-            storage_location=None,  # 测试None值
-            jd_link=None,       # 测试None值
-            tmall_link=None,    # 测试None值
-            xianyu_link=None,   # 测试None值
-            pdd_link=None       # 测试None值
-        )
+        # 测试数据通过批量接口一次写入
+        inventory_ids = manager.bulk_add_inventory([
+            {
+                'brand_id': brand_id,
+                'product_name': "测试商品",
+                'category': "饮料",
+                'quantity': 100,
+                'original_value': 5000.0,
+                'market_value': None,  # 测试None值
+                'expiry_date': None,   # 测试None值
+                'storage_location': None,  # 测试None值
+                'jd_link': None,       # 测试None值
+                'tmall_link': None,    # 测试None值
+                'xianyu_link': None,   # 测试None值
+                'pdd_link': None       # 测试None值
+            }
+        ])
+        inventory_id = inventory_ids[0]
         print(f"✅ 库存添加成功，ID: {inventory_id}")
     except Exception as e:
         print(f"❌ 库存添加失败: {e}")
@@ -73,22 +75,27 @@ def test_inventory_operations():
     
     # 测试4: 修改库存（None值处理）
     print("\n4. 测试修改库存（None值处理）...")
+    update_kwargs = {
+        'product_name': "修改后的商品",
+        'quantity': 150,
+        'original_value': 6000.0,
+        'market_value': 0.0,  # 测试0值（按原值保存为0，不转换为None；未填写转None只在界面层处理）
+        'status': "approved",
+        'storage_location': None  # 测试None值
+    }
+    updated = None
     try:
-        success = manager.update_inventory(
-            inventory_id,
-            product_name="修改后的商品",
-            quantity=150,
-            original_value=6000.0,
-            market_value=0.0,  # 测试0值（应该转换为None）
-            status="approved",
-            storage_location=None  # 测试None值
-        )
-        if success:
-            print("✅ 库存修改成功")
-        else:
-            print("❌ 库存修改失败")
+        # 直接取UPDATE返回的新行核对，无需再查询一次
+        updated = manager.update_inventory(inventory_id, return_row=True, **update_kwargs)
     except Exception as e:
         print(f"❌ 库存修改异常: {e}")
+    # 字段核对放在异常处理之外，不一致时断言失败直接报告
+    if updated:
+        for field, value in update_kwargs.items():
+            assert updated[field] == value, f"字段 {field} 期望 {value}，实际 {updated[field]}"
+        print("✅ 库存修改成功，修改后字段均已核对")
+    else:
+        print("❌ 库存修改失败")
     
     # 测试5: 添加销售渠道（None值佣金率）
     print("\n5. 测试添加销售渠道（None值佣金率）...")
@@ -5,33 +5,35 @@
 """
 
 from inventory_manager import InventoryManager
+from output_buffer import buffered_output
 
-def test_simple_delete():
-    """简单测试删除功能"""
+@buffered_output
+def test_simple_delete(txn_manager):
+    """简单测试删除功能（pytest下在回滚事务中运行，不影响其他测试的数据）"""
+    manager = txn_manager
     print("=== 简单测试删除功能 ===")
     
-    manager = InventoryManager()
+    # 只统计数量，不读取整张表
+    print(f"当前库存数量: {manager.count_inventory()}")
     
-    # 获取当前库存列表
-    inventory_list = manager.get_all_inventory()
-    print(f"当前库存数量: {len(inventory_list)}")
-    
-    if not inventory_list:
+    test_item = manager.get_first_inventory()
+    if not test_item:
         print("❌ 没有库存数据，先添加一些测试数据")
-        # 添加测试数据
+        # 添加测试数据（批量接口，需要更多种子数据时直接在列表中追加）
         brand_id = manager.add_brand("测试品牌", "测试联系人", "13800138000")
-        inventory_id = manager.add_inventory(
-            brand_id=brand_id,
-            product_name="测试商品",
-            category="饮料",
-            quantity=100,
-            original_value=1000.0
-        )
-        print(f"✅ 添加测试数据: ID={inventory_id}")
-        inventory_list = manager.get_all_inventory()
+        inventory_ids = manager.bulk_add_inventory([
+            {
+                'brand_id': brand_id,
+                'product_name': "测试商品",
+                'category': "饮料",
+                'quantity': 100,
+                'original_value': 1000.0
+            }
+        ])
+        print(f"✅ 添加测试数据: ID={', '.join(map(str, inventory_ids))}")
+        test_item = manager.get_first_inventory()
     
     # 选择第一个库存进行测试删除
-    test_item = inventory_list[0]
     test_id = test_item['id']
     test_name = test_item['product_name']
     
@@ -43,19 +45,18 @@ def test_simple_delete():
         print(f"✅ 删除成功: ID={test_id}")
         
         # 验证删除
-        remaining_list = manager.get_all_inventory()
-        print(f"删除后库存数量: {len(remaining_list)}")
+        print(f"删除后库存数量: {manager.count_inventory()}")
         
         # 检查是否真的没有这个ID了
-        deleted_item = manager.get_inventory_by_id(test_id)
-        if deleted_item is None:
+        if not manager.inventory_exists(test_id):
             print(f"✅ 确认删除: ID={test_id} 已不存在")
         else:
             print(f"❌ 删除验证失败: ID={test_id} 仍然存在")
-            print(f"仍然存在的数据: {deleted_item}")
+            print(f"仍然存在的数据: {manager.get_inventory_by_id(test_id)}")
             
     else:
         print(f"❌ 删除失败: ID={test_id}")
 
 if __name__ == "__main__":
-    test_simple_delete()
\ No newline at end of file
+    # 单独运行时使用内存数据库，不改动inventory.db
+    test_simple_delete(InventoryManager(db_path=":memory:"))
\ No newline at end of file
@@ -4,63 +4,120 @@
 简化版混合解决方案功能测试
 """
 
-import sqlite3
+import pytest
+
 from inventory_manager import InventoryManager
+from output_buffer import buffered_output
+
+# 各实体的“添加 → 修改 → 删除”流程配置（与test_hybrid_solution的CRUD_SPECS格式一致）
+# 库存的添加参数中会补上测试品牌ID
+ENTITY_CASES = [
+    {
+        'name': 'inventory',
+        'label': '库存',
+        'title': '\n📦 测试库存功能...',
+        'add': 'add_inventory',
+        'add_kwargs': {
+            'product_name': "测试商品",
+            'category': "饮料",
+            'quantity': 100,
+            'original_value': 1000.0
+        },
+        'update': 'update_inventory',
+        'update_kwargs': {'product_name': "修改商品", 'quantity': 150},
+        'delete': 'delete_inventory'
+    },
+    {
+        'name': 'media',
+        'label': '媒体',
+        'title': '\n📺 测试媒体功能...',
+        'add': 'add_media_resource',
+        'add_kwargs': {
+            'media_name': "测试媒体",
+            'media_type': "社区门禁",
+            'media_form': "静态海报",
+            'location': "测试位置",
+            'market_price': 5000.0,
+            'discount_rate': 80.0,
+            'actual_cost': 4000.0
+        },
+        'update': 'update_media_resource',
+        'update_kwargs': {'media_name': "修改媒体"},
+        'delete': 'delete_media_resource'
+    },
+    {
+        'name': 'channel',
+        'label': '渠道',
+        'title': '\n🛒 测试渠道功能...',
+        'add': 'add_sales_channel',
+        'add_kwargs': {
+            'channel_name': "测试渠道",
+            'channel_type': "S级(团长)",
+            'contact_person': "测试团长",
+            'contact_phone': "13800138000",
+            'commission_rate': 5.0,
+            'payment_terms': "月结"
+        },
+        'update': 'update_sales_channel',
+        'update_kwargs': {'channel_name': "修改渠道"},
+        'delete': 'delete_sales_channel'
+    }
+]
+
+def _run_entity(manager, spec):
+    """
+    对一种实体执行添加、修改、删除，整个过程合并为一个事务
+    
+    Returns:
+        (修改是否成功, 删除是否成功)
+    """
+    label = spec['label']
+    add_kwargs = dict(spec['add_kwargs'])
+    
+    # 测试品牌不单独删除：pytest下由txn_manager回滚，单独运行时使用内存数据库
+    with manager.transaction():
+        print(spec['title'])
+        
+        if spec['name'] == "inventory":
+            # 添加品牌
+            brand_id = manager.add_brand("测试品牌", "测试联系人", "13800138000", brand_type="饮料", reputation_score=8)
+            print(f"✅ 添加品牌: ID={brand_id}")
+            add_kwargs['brand_id'] = brand_id
+        
+        record_id = getattr(manager, spec['add'])(**add_kwargs)
+        print(f"✅ 添加{label}: ID={record_id}")
+        
+        updated = getattr(manager, spec['update'])(record_id, **spec['update_kwargs'])
+        print(f"{'✅' if updated else '❌'} 修改{label}: {updated}")
+        
+        deleted = getattr(manager, spec['delete'])(record_id)
+        print(f"{'✅' if deleted else '❌'} 删除{label}: {deleted}")
+    
+    return updated, deleted
 
-def test_basic_functions():
-    """测试基本功能"""
+@pytest.mark.parametrize("spec", ENTITY_CASES, ids=[spec['name'] for spec in ENTITY_CASES])
+@buffered_output
+def test_basic_functions(txn_manager, spec):
+    """测试基本功能（每种实体一个用例，可由pytest-xdist分配到不同进程）"""
+    updated, deleted = _run_entity(txn_manager, spec)
+    assert updated, f"{spec['name']} 修改失败"
+    assert deleted, f"{spec['name']} 删除失败"
+
+@buffered_output
+def main(manager):
+    """
+    单独运行时依次测试三种实体
+    
+    每种实体的操作几乎全是写入，而SQLite同一时间只允许一个写事务，
+    放到多个线程中也只能排队执行，因此不做并行
+    """
     print("🚀 开始测试混合解决方案基本功能...")
     
-    manager = InventoryManager()
-    
-    # 测试库存功能
-    print("\n📦 测试库存功能...")
-    
-    # 添加品牌
-    brand_id = manager.add_brand("测试品牌", "测试联系人", "13800138000", brand_type="饮料", reputation_score=8)
-    print(f"✅ 添加品牌: ID={brand_id}")
-    
-    # 添加库存
-    inventory_id = manager.add_inventory(brand_id, "测试商品", "饮料", 100, 1000.0)
-    print(f"✅ 添加库存: ID={inventory_id}")
-    
-    # 修改库存
-    success = manager.update_inventory(inventory_id, product_name="修改商品", quantity=150)
-    print(f"{'✅' if success else '❌'} 修改库存: {success}")
-    
-    # 删除库存
-    success = manager.delete_inventory(inventory_id)
-    print(f"{'✅' if success else '❌'} 删除库存: {success}")
-    
-    # 清理品牌
-    manager.delete_brand(brand_id)
-    print("✅ 清理完成")
-    
-    # 测试媒体功能
-    print("\n📺 测试媒体功能...")
-    
-    media_id = manager.add_media_resource("测试媒体", "社区门禁", "静态海报", "测试位置", 5000.0, 80.0, 4000.0)
-    print(f"✅ 添加媒体: ID={media_id}")
-    
-    success = manager.update_media_resource(media_id, media_name="修改媒体")
-    print(f"{'✅' if success else '❌'} 修改媒体: {success}")
-    
-    success = manager.delete_media_resource(media_id)
-    print(f"{'✅' if success else '❌'} 删除媒体: {success}")
-    
-    # 测试渠道功能
-    print("\n🛒 测试渠道功能...")
-    
-    channel_id = manager.add_sales_channel("测试渠道", "S级(团长)", "测试团长", "13800138000", 5.0, "月结")
-    print(f"✅ 添加渠道: ID={channel_id}")
-    
-    success = manager.update_sales_channel(channel_id, channel_name="修改渠道")
-    print(f"{'✅' if success else '❌'} 修改渠道: {success}")
-    
-    success = manager.delete_sales_channel(channel_id)
-    print(f"{'✅' if success else '❌'} 删除渠道: {success}")
+    for spec in ENTITY_CASES:
+        _run_entity(manager, spec)
     
     print("\n🎉 混合解决方案基本功能测试完成！")
 
 if __name__ == "__main__":
-    test_basic_functions()
\ No newline at end of file
+    # 单独运行时使用内存数据库，不改动inventory.db
+    main(InventoryManager(db_path=":memory:"))
\ No newline at end of file
@@ -6,17 +6,15 @@
 """
 
 import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from inventory_manager import InventoryManager
+from output_buffer import buffered_output
 
-def test_update_inventory():
+@buffered_output
+def test_update_inventory(manager):
     """测试修改库存功能"""
     print("🧪 测试修改库存功能...")
     
-    manager = InventoryManager()
-    
     # 首先添加一个测试品牌
     brand_id = manager.add_brand(
         brand_name="测试品牌",
@@ -44,46 +42,33 @@ def test_update_inventory():
     original_data = manager.get_inventory_by_id(inventory_id)
     print(f"原始数据: {original_data}")
     
-    # 测试修改功能
-    success = manager.update_inventory(
+    # 测试修改功能（直接返回修改后的行，无需再查询一次）
+    updated_data = manager.update_inventory(
         inventory_id,
+        return_row=True,
         product_name="修改后的商品名称",
         quantity=150,
         original_value=5500.0,
         status="approved"
     )
     
-    if success:
-        print("✅ 库存修改成功")
-        
-        # 验证修改结果
-        updated_data = manager.get_inventory_by_id(inventory_id)
-        print(f"修改后数据: {updated_data}")
-        
-        # 检查修改是否正确
-        checks = [
-            updated_data['product_name'] == "修改后的商品名称",
-            updated_data['quantity'] == 150,
-            updated_data['original_value'] == 5500.0,
-            updated_data['status'] == "approved"
-        ]
-        
-        if all(checks):
-            print("✅ 所有字段修改正确")
-            return True
-        else:
-            print("❌ 字段修改不正确")
-            return False
-    else:
-        print("❌ 库存修改失败")
-        return False
+    assert updated_data, "库存修改失败"
+    print("✅ 库存修改成功")
+    
+    # 验证修改结果
+    print(f"修改后数据: {updated_data}")
+    
+    # 检查修改是否正确
+    actual = (updated_data['product_name'], updated_data['quantity'],
+              updated_data['original_value'], updated_data['status'])
+    assert actual == ("修改后的商品名称", 150, 5500.0, "approved"), f"字段修改不正确: {updated_data}"
+    print("✅ 所有字段修改正确")
 
-def test_update_brand():
+@buffered_output
+def test_update_brand(manager):
     """测试修改品牌功能"""
     print("\n🧪 测试修改品牌功能...")
     
-    manager = InventoryManager()
-    
     # 添加测试品牌
     brand_id = manager.add_brand(
         brand_name="原始品牌名称",
@@ -109,42 +94,48 @@ def test_update_brand():
         reputation_score=9
     )
     
-    if success:
-        print("✅ 品牌修改成功")
-        
-        # 验证修改结果
-        updated_data = manager.get_brand_by_id(brand_id)
-        print(f"修改后数据: {updated_data}")
-        
-        # 检查修改是否正确
-        checks = [
-            updated_data['brand_name'] == "修改后的品牌名称",
-            updated_data['contact_person'] == "修改后的联系人",
-            updated_data['contact_email'] == "updated@example.com",
-            updated_data['reputation_score'] == 9
-        ]
-        
-        if all(checks):
-            print("✅ 所有字段修改正确")
-            return True
-        else:
-            print("❌ 字段修改不正确")
-            return False
-    else:
-        print("❌ 品牌修改失败")
+    assert success, "品牌修改失败"
+    print("✅ 品牌修改成功")
+    
+    # 验证修改结果
+    updated_data = manager.get_brand_by_id(brand_id)
+    print(f"修改后数据: {updated_data}")
+    
+    # 检查修改是否正确
+    actual = (updated_data['brand_name'], updated_data['contact_person'],
+              updated_data['contact_email'], updated_data['reputation_score'])
+    assert actual == ("修改后的品牌名称", "修改后的联系人", "updated@example.com", 9), f"字段修改不正确: {updated_data}"
+    print("✅ 所有字段修改正确")
+
+def run_test(test_func, manager) -> bool:
+    """
+    单独运行时执行一项测试，断言失败时打印原因而不中断后续测试
+    
+    Returns:
+        测试是否通过
+    """
+    try:
+        test_func(manager)
+    except AssertionError as e:
+        print(f"❌ {e}")
         return False
+    return True
 
+@buffered_output
 def main():
     """主测试函数"""
     print("="*60)
     print("🧪 修改功能测试")
     print("="*60)
     
+    # 两项测试共用一个管理器，使用内存数据库，不改动inventory.db
+    manager = InventoryManager(db_path=":memory:")
+    
     # 测试库存修改
-    inventory_test_passed = test_update_inventory()
+    inventory_test_passed = run_test(test_update_inventory, manager)
     
     # 测试品牌修改
-    brand_test_passed = test_update_brand()
+    brand_test_passed = run_test(test_update_brand, manager)
     
     print("\n" + "="*60)
     print("📊 测试结果总结:")